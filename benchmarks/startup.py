@@ -0,0 +1,80 @@
+"""Cold start and rerun timings for every page.
+
+Run from the repository root:
+
+    python benchmarks/startup.py [--reruns 20]
+
+Cold start imports each page script in a fresh interpreter (without running
+``main()``) and reports wall time plus which heavy modules ended up loaded.
+Rerun latency drives each page through Streamlit's ``AppTest`` harness with
+empty input, which is what every widget interaction on an idle page costs.
+"""
+import argparse
+import glob
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["pandas", "PIL", "xlsxwriter", "requests"]
+
+COLD_START_SNIPPET = """
+import runpy, sys, time
+start = time.perf_counter()
+runpy.run_path(sys.argv[1], run_name="__bench__")
+elapsed = time.perf_counter() - start
+loaded = [name for name in sys.argv[2].split(",") if name in sys.modules]
+print(f"{elapsed:.4f}|{','.join(loaded)}")
+"""
+
+
+def page_scripts():
+    return [os.path.join(ROOT, "Hello.py")] + sorted(glob.glob(os.path.join(ROOT, "pages", "*.py")))
+
+
+def cold_start(script):
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", COLD_START_SNIPPET, script, ",".join(HEAVY_MODULES)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    total = time.perf_counter() - start
+    page_time, loaded = result.stdout.strip().splitlines()[-1].split("|")
+    return total, float(page_time), loaded or "-"
+
+
+def rerun_latency(script, reruns):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(script, default_timeout=30)
+    start = time.perf_counter()
+    app.run()
+    first = time.perf_counter() - start
+
+    timings = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        app.run()
+        timings.append(time.perf_counter() - start)
+    return first, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    print(f"{'page':<36} {'process':>9} {'import':>9} {'1st run':>9} {'rerun':>9}  heavy modules loaded")
+    for script in page_scripts():
+        total, page_time, loaded = cold_start(script)
+        first, rerun = rerun_latency(script, args.reruns)
+        name = os.path.relpath(script, ROOT)
+        print(f"{name:<36} {total * 1000:>7.0f}ms {page_time * 1000:>7.0f}ms "
+              f"{first * 1000:>7.0f}ms {rerun * 1000:>7.1f}ms  {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""HTTP/2 vs pooled HTTP/1.1 on the catalog workload.
+
+Run from the repository root with credentials in .streamlit/secrets.toml and
+``httpx[http2]`` installed:
+
+    python benchmarks/transport.py ARTIST_ID [ARTIST_ID ...] [--market US] [--concurrency 16] [--repeat 3]
+
+Each round lists the artists' albums and then fetches album details (album,
+track pages and /tracks batches) concurrently, once per transport. Rounds
+alternate between transports so network drift affects both equally.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.api import transport_name, use_http2
+from utils.auth import get_access_token
+from utils.catalog import get_album_details, get_artist_albums
+from utils.profiling import context_task, recording
+
+
+def run_catalog(artist_ids, market, access_token, concurrency):
+    albums = [album for artist_id in artist_ids for album in get_artist_albums(artist_id, market, access_token)]
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(context_task(get_album_details, album.id, access_token))
+            for album in albums
+        ]
+        tracks = sum(len(future.result()[0]) for future in futures)
+    return len(albums), tracks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("artist_ids", nargs="+")
+    parser.add_argument("--market", default="US")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    access_token = get_access_token()
+    if not access_token:
+        sys.exit("Could not get an access token.")
+
+    results = {}
+    for _ in range(args.repeat):
+        for http2 in (False, True):
+            use_http2(http2)
+            with recording() as recorder:
+                start = time.perf_counter()
+                albums, tracks = run_catalog(args.artist_ids, args.market, access_token, args.concurrency)
+                elapsed = time.perf_counter() - start
+            calls = recorder.totals.get("network", (0, 0.0))[0]
+            # transport_name() reflects any fallback that happened during the round
+            results.setdefault(transport_name(), []).append((elapsed, calls, albums, tracks))
+
+    print(f"{'transport':<22} {'median':>9} {'best':>9} {'requests':>9} {'req/s':>8} {'albums':>7} {'tracks':>7}")
+    for name, rounds in results.items():
+        times = [elapsed for elapsed, _, _, _ in rounds]
+        _, calls, albums, tracks = rounds[-1]
+        median = statistics.median(times)
+        print(f"{name:<22} {median:>8.2f}s {min(times):>8.2f}s {calls:>9} {calls / median:>8.1f} {albums:>7} {tracks:>7}")
+
+
+if __name__ == "__main__":
+    main()
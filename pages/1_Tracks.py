@@ -1,20 +1,11 @@
-import requests
-import base64
-import pandas as pd
 import streamlit as st
-from io import BytesIO
-import re
 
 from utils.auth import get_access_token
+from utils.diagnostics import run_page
+from utils.exports import excel_download
 from utils.parse import parse_track_ids
 from utils.tracks import get_tracks
-from utils.tools import to_excel
-
-
-def ms_to_min_sec(ms):
-    minutes = ms // 60000
-    seconds = (ms % 60000) // 1000
-    return f"{minutes}:{seconds:02}"
+from utils.tools import ms_to_min_sec, to_dataframe
 
 # Main Streamlit app
 def main():
@@ -38,27 +29,21 @@ def main():
 
         if tracks:
             simplified_data = [{
-                "Track Artist(s)": ", ".join([artist["name"] for artist in t["artists"]]),
-                "Track Name": t["name"],
-                "ISRC": t.get("external_ids", {}).get("isrc", "N/A"),
-                "Duration": ms_to_min_sec(t["duration_ms"]),
-                "Explicit": "Yes" if t["explicit"] else "No",
-                "Spotify URL": t["external_urls"]["spotify"]
-            } for t in tracks]
-
-            df = pd.DataFrame(simplified_data)
+                "Track Artist(s)": t.artists,
+                "Track Name": t.name,
+                "ISRC": t.isrc,
+                "Duration": ms_to_min_sec(t.duration_ms),
+                "Explicit": "Yes" if t.explicit else "No",
+                "Spotify URL": t.spotify_url
+            } for t in tracks if t is not None]
+
+            df = to_dataframe(simplified_data)
             st.dataframe(df, use_container_width=True, hide_index=True)
 
-            excel_data = to_excel(df)
-            st.download_button(
-                label="📥 Download as Excel",
-                data=excel_data,
-                file_name="spotify_tracks.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+            excel_download(df, "📥 Download as Excel", "spotify_tracks.xlsx", key="tracks_export")
         else:
             st.warning("No valid tracks found.")
 
 
 if __name__ == "__main__":
-    main()
+    run_page(main)
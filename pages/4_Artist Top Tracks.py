@@ -1,72 +1,74 @@
-import requests
-import base64
-import pandas as pd
 import streamlit as st
-from io import BytesIO
-from PIL import Image
-from urllib.request import urlopen
-import re
+import time
 
+from utils.artists import get_artists, get_artists_top_tracks
 from utils.auth import get_access_token
-from utils.tools import to_excel
-from utils.parse import parse_artist_id
-
-# Get artist metadata and top tracks
-def get_artist_metadata_and_top_tracks(artist_id, access_token, market="US"):
-    headers = {"Authorization": f"Bearer {access_token}"}
-    artist_url = f"https://api.spotify.com/v1/artists/{artist_id}"
-    top_tracks_url = f"{artist_url}/top-tracks?market={market}"
-
-    artist_response = requests.get(artist_url, headers=headers).json()
-    top_tracks_response = requests.get(top_tracks_url, headers=headers).json()
-
-    artist_name = artist_response.get("name", "Unknown Artist")
-    artist_image_url = artist_response["images"][0]["url"] if artist_response.get("images") else None
-    top_tracks = top_tracks_response.get("tracks", [])
-
-    return artist_name, artist_image_url, top_tracks
+from utils.constants import DEFAULT_MARKET, MARKETS
+from utils.diagnostics import run_page
+from utils.exports import excel_download
+from utils.tools import to_dataframe
+from utils.parse import parse_artist_ids
 
 # Streamlit app
 def main():
     st.title("🎤 Spotify Artist Top Tracks")
-    user_input = st.text_input("Enter a Spotify artist URI, URL, or ID")
+    user_input = st.text_area("Enter Spotify artist URIs, URLs, or IDs (one per line)")
+    market = st.selectbox("Select Market (Country Code)", MARKETS, index=MARKETS.index(DEFAULT_MARKET))
+
+    if st.button("🔍 Get Top Tracks"):
+        # Invalid lines are reported and skipped so they can't fail a whole /artists batch
+        artist_ids = parse_artist_ids(user_input)
+
+        if not artist_ids:
+            st.error("Please enter at least one valid artist ID.")
+            return
 
-    if user_input:
-        artist_id = parse_artist_id(user_input)
         access_token = get_access_token()
-        artist_name, artist_image_url, top_tracks = get_artist_metadata_and_top_tracks(artist_id, access_token)
+        start_time = time.time()
 
-        if top_tracks:
-            simplified_data = [{
-                "Track Name": t["name"],
-                "Album Name": t["album"]["name"],
-                "Artist(s)": ", ".join([artist["name"] for artist in t["artists"]]),
-                "ISRC": t.get("external_ids", {}).get("isrc", "N/A"),
-                "Spotify URL": t["external_urls"]["spotify"]
-            } for t in top_tracks]
+        with st.spinner("⏳ Processing...", show_time=True):
+            artists, failed = get_artists(artist_ids, access_token)
+            top_tracks = get_artists_top_tracks([aid for aid in artist_ids if aid in artists], market, access_token)
 
-            df = pd.DataFrame(simplified_data)
-            st.dataframe(df, use_container_width=True, hide_index=True)
+        elapsed = time.time() - start_time
+        st.success(f"✅ Done! Processed {len(artist_ids)} artist(s) in {elapsed:.2f} seconds.")
+
+        # Artists from failed batches were already reported with the batch error
+        missing = [aid for aid in artist_ids if aid not in artists and aid not in failed]
+        if missing:
+            st.warning(f"Could not find {len(missing)} artist(s): {', '.join(missing)}")
 
-            excel_data = to_excel(df)
-            st.download_button(
-                label="📥 Download as Excel",
-                data=excel_data,
-                file_name="artist_top_tracks.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
-        
-        if artist_image_url:
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.write(' ')
-            with col2:
-                 st.image(artist_image_url, caption=artist_name, width=300)
-            with col3:
-                st.write(' ')
+        simplified_data = []
+        for artist_id, tracks in top_tracks.items():
+            for rank, t in enumerate(tracks, 1):
+                simplified_data.append({
+                    "Artist": artists[artist_id].name,
+                    "Rank": rank,
+                    "Track Name": t.name,
+                    "Album Name": t.album_name,
+                    "Artist(s)": t.artists,
+                    "ISRC": t.isrc,
+                    "Spotify URL": t.spotify_url
+                })
 
+        if simplified_data:
+            df = to_dataframe(simplified_data)
+            st.dataframe(df, use_container_width=True, hide_index=True)
+
+            excel_download(df, "📥 Download as Excel", f"artist_top_tracks_{market}.xlsx", key="top_tracks_export")
         else:
             st.warning("No top tracks found or invalid artist.")
 
+        if len(artists) == 1:
+            artist = next(iter(artists.values()))
+            if artist.image_url:
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.write(' ')
+                with col2:
+                    st.image(artist.image_url, caption=artist.name, width=300)
+                with col3:
+                    st.write(' ')
+
 if __name__ == "__main__":
-    main()
+    run_page(main)
@@ -0,0 +1,91 @@
+import json
+import time
+import streamlit as st
+
+from utils.diagnostics import run_page
+from utils.exports import excel_download
+from utils.jobs import ACTIVE_STATUSES, JOB_KINDS, cancel_job, ensure_workers, get_job_rows, job_throughput, list_jobs
+from utils.tools import to_dataframe
+
+STATUS_ICONS = {
+    "queued": "🕒",
+    "running": "⏳",
+    "done": "✅",
+    "failed": "❌",
+    "cancelled": "✖️",
+}
+
+def format_time(timestamp):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp)) if timestamp else ""
+
+# Status table refreshes itself while the rest of the page stays put
+@st.fragment(run_every=5)
+def job_overview():
+    jobs = list_jobs()
+    if not jobs:
+        st.info("No jobs submitted yet. Use \"Run in Background\" on the Albums, Playlists or Multiple Artist Catalog pages.")
+        return
+
+    overview = []
+    for job in jobs:
+        throughput = job_throughput(job)
+        overview.append({
+            "Job": job["id"],
+            "Type": JOB_KINDS.get(job["kind"], job["kind"]),
+            "Label": job["label"],
+            "Status": f"{STATUS_ICONS.get(job['status'], '')} {job['status'].capitalize()}",
+            "Progress": job["progress"] / job["total"] if job["total"] else 0.0,
+            "Tracks": job["items"],
+            "Tracks/sec": round(throughput, 2) if throughput else None,
+            "Submitted": format_time(job["created_at"]),
+            "Finished": format_time(job["finished_at"]),
+        })
+
+    st.dataframe(
+        to_dataframe(overview),
+        use_container_width=True,
+        hide_index=True,
+        column_config={"Progress": st.column_config.ProgressColumn("Progress", min_value=0.0, max_value=1.0)}
+    )
+
+def main():
+    st.title("🗂️ Background Jobs")
+    ensure_workers()
+
+    job_overview()
+
+    jobs = list_jobs()
+    for job in jobs:
+        title = f"{STATUS_ICONS.get(job['status'], '')} #{job['id']} · {job['label']}"
+        with st.expander(title, expanded=job["status"] in ACTIVE_STATUSES):
+            if job["status"] in ACTIVE_STATUSES:
+                st.write(f"{job['progress']} / {job['total'] or '?'} processed, {job['items']} tracks so far.")
+                if st.button("✖️ Cancel", key=f"cancel_{job['id']}"):
+                    cancel_job(job["id"])
+                    st.rerun()
+            if job["timings"]:
+                with st.popover("⏱️ Stage timings"):
+                    st.dataframe(to_dataframe(json.loads(job["timings"])), use_container_width=True, hide_index=True)
+
+            if job["status"] == "failed":
+                st.error(f"Job failed: {job['error']}")
+            elif job["status"] == "done":
+                if job["error"]:
+                    failures = job["error"].splitlines()
+                    st.warning(f"Finished with {len(failures)} error(s):\n\n" + "\n".join(f"- {line}" for line in failures))
+                # Results are only decompressed for jobs the user opens
+                if not st.toggle("📄 Show results", key=f"show_results_{job['id']}"):
+                    continue
+                rows = get_job_rows(job["id"])
+                if not rows:
+                    st.warning("No data was collected.")
+                    continue
+                df = to_dataframe(rows)
+                st.dataframe(df, use_container_width=True, hide_index=True)
+                excel_download(df, "📥 Download Excel File", f"Job_{job['id']}_{job['kind']}.xlsx", key=f"job_export_{job['id']}", prepare=True)
+            elif job["status"] == "cancelled":
+                st.write("Job was cancelled.")
+
+
+if __name__ == "__main__":
+    run_page(main)
@@ -0,0 +1,66 @@
+import time
+import streamlit as st
+
+from utils.diagnostics import run_page
+from utils.exports import excel_download
+from utils.snapshots import DIFF_LABELS, diff_snapshots, flatten_diff, list_snapshot_keys, list_snapshots, load_snapshot
+from utils.tools import to_dataframe
+
+def format_snapshot(snapshot):
+    created = time.strftime("%Y-%m-%d %H:%M", time.localtime(snapshot["created_at"]))
+    return f"#{snapshot['id']} · {created} · {snapshot['releases']} releases, {snapshot['tracks']} tracks"
+
+def main():
+    st.title("🕘 Catalog History")
+    st.caption("Snapshots are saved automatically by the catalog pages and background catalog jobs. Comparisons run against the local store, not the API.")
+
+    keys = list_snapshot_keys()
+    if not keys:
+        st.info("No snapshots yet. Run an artist catalog first.")
+        return
+
+    key = st.selectbox(
+        "Artist and market",
+        keys,
+        format_func=lambda k: f"{k['artist_name'] or k['artist_id']} ({k['artist_id']}) · {k['market']} · {k['snapshots']} snapshot(s)"
+    )
+    snapshots = list_snapshots(key["artist_id"], key["market"])
+    if len(snapshots) < 2:
+        st.info("Only one snapshot stored for this artist and market. Run the catalog again later to compare.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        old = st.selectbox("Compare", snapshots[1:], format_func=format_snapshot)
+    with col2:
+        new = st.selectbox("With", snapshots, format_func=format_snapshot)
+
+    diff = diff_snapshots(load_snapshot(old["id"]), load_snapshot(new["id"]))
+
+    metric_columns = st.columns(len(DIFF_LABELS))
+    for column, (name, label) in zip(metric_columns, DIFF_LABELS.items()):
+        column.metric(label, len(diff[name]))
+
+    changes = flatten_diff(diff)
+    if not changes:
+        st.success("✅ No changes between these snapshots.")
+        return
+
+    excel_download(
+        to_dataframe(changes),
+        "📥 Download Changes as Excel",
+        f"{key['artist_id']}_{key['market']}_{old['id']}_vs_{new['id']}.xlsx",
+        key="history_export"
+    )
+
+    tabs = st.tabs(list(DIFF_LABELS.values()))
+    for tab, name in zip(tabs, DIFF_LABELS):
+        with tab:
+            if diff[name]:
+                st.dataframe(to_dataframe(diff[name]), use_container_width=True, hide_index=True)
+            else:
+                st.write("Nothing here.")
+
+
+if __name__ == "__main__":
+    run_page(main)
@@ -0,0 +1,54 @@
+from utils.api import API_BASE, spotify_get
+from utils.profiling import span
+from utils.records import album_record
+
+# Get album metadata and all track IDs (with pagination)
+def get_album_tracks(album_id, access_token, market=None):
+    market_params = {"market": market} if market else {}
+    album_data = spotify_get(f"{API_BASE}/albums/{album_id}", access_token, params=market_params or None)
+    with span("projection"):
+        album = album_record(album_data)
+
+    # The album object already carries the first page of tracks
+    tracks_page = album_data.get("tracks", {})
+    del album_data
+
+    track_ids = []
+    limit = 50
+    offset = 0
+
+    while True:
+        items = tracks_page.get("items", [])
+        if not items:
+            break
+        track_ids.extend([t["id"] for t in items])
+        if tracks_page.get("next") is None:
+            break
+        offset += len(items)
+        tracks_page = spotify_get(
+            f"{API_BASE}/albums/{album_id}/tracks",
+            access_token,
+            params={"limit": limit, "offset": offset, **market_params}
+        )
+
+    return track_ids, album
+
+def build_album_rows(tracks, album):
+    with span("build rows"):
+        simplified_data = []
+        for t in tracks:
+            if t is None:
+                continue
+            simplified_data.append({
+                "Disc Number": t.disc_number,
+                "Track Number": t.track_number,
+                "Track Name": t.name,
+                "Album Name": t.album_name,
+                "Artist(s)": t.artists,
+                "ISRC": t.isrc,
+                "Spotify URL": t.spotify_url,
+                "UPC": album.upc,
+                "Label": album.label,
+                "℗ Line": album.p_line
+            })
+    return simplified_data
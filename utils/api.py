@@ -0,0 +1,232 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+from utils.profiling import span
+
+API_BASE = "https://api.spotify.com/v1"
+
+# Set SPOTTOOLS_HTTP2=1 to send Web API calls over HTTP/2 (needs `pip install "httpx[http2]"`).
+# Without httpx/h2, or if the API host does not negotiate HTTP/2, calls use the pooled HTTP/1.1 session.
+# Other hosts (the accounts token endpoint) always use the HTTP/1.1 session.
+HTTP2_ENABLED = os.environ.get("SPOTTOOLS_HTTP2", "0") == "1"
+HTTP2_MAX_CONNECTIONS = 4
+REQUEST_TIMEOUT = 30
+# Rate-limited (429) calls wait out Retry-After and are retried this many times;
+# a longer wait than RETRY_AFTER_LIMIT seconds is reported as an error instead
+MAX_RETRIES = 3
+RETRY_AFTER_LIMIT = 30
+
+class SpotifyAPIError(Exception):
+    def __init__(self, status_code, message):
+        super().__init__(f"{message} (HTTP {status_code})" if status_code else message)
+        self.status_code = status_code
+        self.message = message
+
+_session = None
+_http11 = None
+_session_lock = threading.Lock()
+# Protocol the current httpx client negotiated with the API host on its first response
+_negotiated = None
+# Requests in flight per httpx client, so a client replaced by the fallback is closed once it goes idle
+_in_flight = Counter()
+_retired = set()
+
+def _http11_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+    return session
+
+# Many concurrent requests are multiplexed as streams over a few connections
+def _http2_client():
+    try:
+        import h2  # noqa: F401 - httpx only negotiates HTTP/2 when h2 is installed
+        import httpx
+    except ImportError:
+        return None
+    return httpx.Client(
+        http2=True,
+        timeout=REQUEST_TIMEOUT,
+        limits=httpx.Limits(max_connections=HTTP2_MAX_CONNECTIONS, max_keepalive_connections=HTTP2_MAX_CONNECTIONS)
+    )
+
+# One client per process; requests/httpx are only imported on the first API call
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = (_http2_client() if HTTP2_ENABLED else None) or _shared_http11()
+    return _session
+
+# Called with _session_lock held
+def _shared_http11():
+    global _http11
+    if _http11 is None:
+        _http11 = _http11_session()
+    return _http11
+
+def get_http11_session():
+    with _session_lock:
+        return _shared_http11()
+
+def use_http2(enabled):
+    global _session, _negotiated, HTTP2_ENABLED
+    with _session_lock:
+        HTTP2_ENABLED = enabled
+        if _session is not None and _is_httpx(_session):
+            _retire(_session)
+        _session = None
+        _negotiated = None
+
+def transport_name():
+    session = get_session()
+    if not _is_httpx(session):
+        return "HTTP/1.1 (requests)"
+    return f"{_negotiated} (httpx)" if _negotiated else "httpx (not negotiated yet)"
+
+def _is_httpx(session):
+    return type(session).__module__.startswith("httpx")
+
+# Called with _session_lock held
+def _retire(session):
+    if _in_flight[session]:
+        _retired.add(session)
+    else:
+        session.close()
+
+def _fall_back_to_http11(failed):
+    global _session, _negotiated
+    with _session_lock:
+        if _session is failed:
+            _session = _shared_http11()
+            _negotiated = None
+            _retire(failed)
+        return _session
+
+def _httpx_request(client, method, url, **kwargs):
+    global _negotiated
+    import httpx
+
+    with _session_lock:
+        _in_flight[client] += 1
+        negotiating = _negotiated is None
+    try:
+        return client.request(method, url, **kwargs)
+    except (httpx.ConnectError, httpx.RemoteProtocolError):
+        # Once HTTP/2 is up, a connect blip or protocol error (e.g. a GOAWAY) is an ordinary failure, not a reason to switch
+        if not negotiating:
+            raise
+        # Neither case got a response, so the request is sent again over HTTP/1.1
+        return _fall_back_to_http11(client).request(method, url, **kwargs)
+    finally:
+        with _session_lock:
+            _in_flight[client] -= 1
+            if not _in_flight[client]:
+                del _in_flight[client]
+                if client in _retired:
+                    _retired.discard(client)
+                    client.close()
+
+# Sends a request through the current transport. For Web API calls the process switches to HTTP/1.1
+# if the HTTP/2 client cannot connect, fails to negotiate, or the API host only offers HTTP/1.1 over ALPN.
+def http_request(method, url, **kwargs):
+    global _negotiated
+    kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+    # Only the API host's ALPN result may decide the API transport
+    session = get_session() if url.startswith(API_BASE) else get_http11_session()
+    if not _is_httpx(session):
+        return session.request(method, url, **kwargs)
+
+    response = _httpx_request(session, method, url, **kwargs)
+    if _negotiated is None:
+        if response.http_version == "HTTP/2":
+            with _session_lock:
+                if session is _session:
+                    _negotiated = response.http_version
+        else:
+            # httpx would quietly speak HTTP/1.1 over its few connections; keep this response and switch clients
+            _fall_back_to_http11(session)
+    return response
+
+def _error_message(response):
+    try:
+        error = response.json().get("error")
+    except (ValueError, AttributeError):
+        return response.text or "Request failed"
+    if isinstance(error, dict):
+        return error.get("message") or "Request failed"
+    return error or "Request failed"
+
+def _is_transport_error(e):
+    import requests
+
+    if isinstance(e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    # httpx is only loaded when the HTTP/2 client is in use
+    httpx = sys.modules.get("httpx")
+    return httpx is not None and isinstance(e, httpx.TransportError)
+
+def _retry_after(response, attempt):
+    try:
+        return max(float(response.headers.get("Retry-After")), 0.0)
+    except (TypeError, ValueError):
+        return float(2 ** attempt)
+
+def _get(url, access_token, params):
+    with span("network"):
+        try:
+            return http_request("GET", url, headers={"Authorization": f"Bearer {access_token}"}, params=params)
+        except Exception as e:
+            if not _is_transport_error(e):
+                raise
+            raise SpotifyAPIError(None, f"Request failed: {e}") from e
+
+# Non-2xx responses, timeouts and connection failures raise SpotifyAPIError,
+# so callers never mistake an error body for an empty result
+def _fetch_json(url, access_token, params=None):
+    for attempt in range(MAX_RETRIES + 1):
+        response = _get(url, access_token, params)
+        if response.status_code != 429 or attempt == MAX_RETRIES:
+            break
+        delay = _retry_after(response, attempt)
+        if delay > RETRY_AFTER_LIMIT:
+            break
+        with span("rate limited"):
+            time.sleep(delay)
+    if not 200 <= response.status_code < 300:
+        raise SpotifyAPIError(response.status_code, _error_message(response))
+    with span("json decode"):
+        return response.json()
+
+# Identical GETs already in flight (from any session or worker thread) share one request
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def spotify_get(url, access_token, params=None):
+    key = (url, tuple(sorted((params or {}).items())))
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = Future()
+            _inflight[key] = future
+
+    if not leader:
+        with span("network (coalesced)"):
+            return future.result()
+
+    try:
+        future.set_result(_fetch_json(url, access_token, params))
+    except Exception as e:
+        future.set_exception(e)
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+    return future.result()
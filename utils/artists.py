@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+import streamlit as st
+
+from utils.api import API_BASE, SpotifyAPIError, spotify_get
+from utils.profiling import context_task
+from utils.records import artist_record, track_record
+
+TOP_TRACKS_WORKERS = 8
+
+# Artist metadata through the batch endpoint, 50 artists per call.
+# Returns ({artist_id: ArtistRecord}, [IDs from batches that failed]); IDs in neither were not found.
+def get_artists(artist_ids, access_token):
+    artists = {}
+    failed = []
+    unique_ids = list(dict.fromkeys(artist_ids))
+
+    for i in range(0, len(unique_ids), 50):
+        batch = unique_ids[i:i+50]
+        try:
+            data = spotify_get(f"{API_BASE}/artists", access_token, params={"ids": ",".join(batch)})
+        except SpotifyAPIError as e:
+            st.error(f"Error fetching {len(batch)} artist(s): {e}")
+            failed.extend(batch)
+            continue
+        for artist in data.get("artists", []):
+            if artist:
+                artists[artist["id"]] = artist_record(artist)
+
+    return artists, failed
+
+def get_top_tracks(artist_id, market, access_token):
+    data = spotify_get(f"{API_BASE}/artists/{artist_id}/top-tracks", access_token, params={"market": market})
+    return [track_record(t) for t in data.get("tracks", [])]
+
+# Top tracks for many artists, fetched concurrently; returns {artist_id: [TrackRecord, ...]}.
+# Each task runs in a copy of the caller's context so spans reach its recorder and the profiler samples the pool.
+def get_artists_top_tracks(artist_ids, market, access_token, max_workers=TOP_TRACKS_WORKERS):
+    unique_ids = list(dict.fromkeys(artist_ids))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(context_task(get_top_tracks, artist_id, market, access_token))
+            for artist_id in unique_ids
+        ]
+        top_tracks = {}
+        for artist_id, future in zip(unique_ids, futures):
+            try:
+                top_tracks[artist_id] = future.result()
+            except SpotifyAPIError as e:
+                st.error(f"Error fetching top tracks for {artist_id}: {e}")
+        return top_tracks
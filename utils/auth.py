@@ -1,30 +1,47 @@
 import base64
-import requests
+import threading
+import time
 import streamlit as st
 
+from utils.api import http_request
+from utils.profiling import span
+
+# Client-credential tokens are valid for an hour; reuse one across reruns, sessions and workers
+_token = {"value": None, "expires_at": 0.0}
+_token_lock = threading.Lock()
+TOKEN_EXPIRY_MARGIN = 60
+
 def get_access_token():
-    client_id = st.secrets["CLIENT_ID"]
-    client_secret = st.secrets["CLIENT_SECRET"]
-    auth_url = 'https://accounts.spotify.com/api/token'
-    
-    auth_header = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode('utf-8')
-    headers = {
-        'Authorization': f'Basic {auth_header}',
-        'Content-Type': 'application/x-www-form-urlencoded'
-    }
-    data = {'grant_type': 'client_credentials'}
-    
-    response = requests.post(auth_url, headers=headers, data=data)
-    
-    if response.status_code != 200:
-        st.error(f"Failed to get access token. Status code: {response.status_code}")
-        st.error(f"Response text: {response.text}")
-        return None
-    
-    try:
-        response_data = response.json()
-        return response_data['access_token']
-    except ValueError:
-        st.error("Failed to parse JSON response.")
-        st.error(f"Raw response: {response.text}")
-        return None
+    with _token_lock:
+        if _token["value"] and time.time() < _token["expires_at"]:
+            return _token["value"]
+
+        client_id = st.secrets["CLIENT_ID"]
+        client_secret = st.secrets["CLIENT_SECRET"]
+        auth_url = 'https://accounts.spotify.com/api/token'
+        
+        auth_header = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode('utf-8')
+        headers = {
+            'Authorization': f'Basic {auth_header}',
+            'Content-Type': 'application/x-www-form-urlencoded'
+        }
+        data = {'grant_type': 'client_credentials'}
+        
+        with span("auth"):
+            response = http_request("POST", auth_url, headers=headers, data=data)
+        
+        if response.status_code != 200:
+            st.error(f"Failed to get access token. Status code: {response.status_code}")
+            st.error(f"Response text: {response.text}")
+            return None
+        
+        try:
+            response_data = response.json()
+        except ValueError:
+            st.error("Failed to parse JSON response.")
+            st.error(f"Raw response: {response.text}")
+            return None
+
+        _token["value"] = response_data['access_token']
+        _token["expires_at"] = time.time() + response_data.get('expires_in', 3600) - TOKEN_EXPIRY_MARGIN
+        return _token["value"]
@@ -0,0 +1,62 @@
+from utils.albums import get_album_tracks
+from utils.api import API_BASE, SpotifyAPIError, spotify_get
+from utils.profiling import span
+from utils.records import release_record
+from utils.tools import ms_to_min_sec
+from utils.tracks import get_tracks
+
+def get_artist_albums(artist_id, market, access_token):
+    albums = []
+    seen = set()
+    url = f"{API_BASE}/artists/{artist_id}/albums"
+    params = {"limit": 50, "offset": 0, "market": market, "include_groups": "album,single,compilation"}
+
+    while True:
+        data = spotify_get(url, access_token, params=params)
+        items = data.get("items", [])
+        if not items:
+            break
+        for album in items:
+            if album["id"] not in seen:
+                seen.add(album["id"])
+                albums.append(release_record(album))
+        if data.get("next") is None:
+            break
+        params["offset"] += 50
+
+    return albums
+
+# No market= here: it turns on track relinking, which would swap in another track's ID, ISRC and
+# position, so the export and snapshots describe the album's own tracks at the cost of available_markets
+def get_album_details(album_id, access_token):
+    track_ids, album = get_album_tracks(album_id, access_token)
+
+    # Get full track metadata (for ISRCs, explicit, duration)
+    full_tracks = get_tracks(track_ids, access_token)
+    if len(full_tracks) < len(track_ids):
+        raise SpotifyAPIError(None, f"Only {len(full_tracks)} of {len(track_ids)} tracks of album {album_id} could be fetched")
+
+    with span("build rows"):
+        tracks = []
+        for full in full_tracks:
+            if full is None:
+                continue
+            tracks.append({
+                "Album Name": album.name,
+                "Album Artists": album.artists,
+                "Release Type": album.release_type,
+                "Release Date": album.release_date,
+                "UPC": album.upc,
+                "Label": album.label,
+                "℗ Line": album.p_line,
+                "Disc Number": full.disc_number,
+                "Track Number": full.track_number,
+                "Track Name": full.name,
+                "Track Artists": full.artists,
+                "ISRC": full.isrc,
+                "Spotify URL": full.spotify_url,
+                "Explicit": full.explicit,
+                "Duration": ms_to_min_sec(full.duration_ms)
+            })
+
+    return tracks, album.name, album.image_url
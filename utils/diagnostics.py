@@ -0,0 +1,61 @@
+import time
+import streamlit as st
+
+from utils.profiling import RunProfiler, recording
+from utils.tools import to_dataframe
+
+def _diagnostics_controls():
+    # Profiling is one-shot: switch the toggle back off before it renders on the run after a profiled one
+    if st.session_state.pop("diagnostics_profile_done", False):
+        st.session_state["diagnostics_profile"] = False
+
+    with st.sidebar.expander("🛠️ Diagnostics"):
+        timings = st.toggle("⏱️ Show stage timings", key="diagnostics_timings")
+        profile = st.toggle("🔥 Profile this run", key="diagnostics_profile",
+                            help="Profiles the next run, then switches itself off. The flame graph covers the page "
+                                 "and its worker pools; cProfile stats cover the page script thread only.")
+    return timings, profile
+
+def _show_timings(recorder, elapsed):
+    with st.sidebar.expander("⏱️ Stage timings", expanded=True):
+        st.caption(f"Run took {elapsed:.3f}s. Stages are inclusive of nested stages.")
+        rows = recorder.rows()
+        if rows:
+            st.dataframe(to_dataframe(rows), use_container_width=True, hide_index=True)
+        else:
+            st.write("No instrumented stages ran.")
+
+def _show_profile(profiler):
+    with st.sidebar.expander("🔥 Profile", expanded=True):
+        if profiler.error:
+            st.warning(f"cProfile unavailable: {profiler.error}")
+        pstats_data = profiler.pstats_bytes()
+        if pstats_data:
+            st.download_button("📥 cProfile stats (.prof)", data=pstats_data, file_name="spottools_run.prof",
+                               mime="application/octet-stream", on_click="ignore")
+        st.download_button("📥 Flame graph stacks (.txt)", data=profiler.sampler.collapsed(),
+                           file_name="spottools_run.collapsed.txt", mime="text/plain", on_click="ignore",
+                           help="Collapsed-stack format for speedscope.app or flamegraph.pl")
+        st.code(profiler.summary(), language=None)
+
+# Runs a page's main() with optional stage timings and profiling, both off unless switched on in the sidebar
+def run_page(main):
+    timings, profile = _diagnostics_controls()
+    if not (timings or profile):
+        main()
+        return
+
+    with recording() as recorder:
+        profiler = RunProfiler().start() if profile else None
+        start = time.perf_counter()
+        try:
+            main()
+        finally:
+            if profiler is not None:
+                profiler.stop()
+                st.session_state["diagnostics_profile_done"] = True
+        elapsed = time.perf_counter() - start
+
+    _show_timings(recorder, elapsed)
+    if profiler is not None:
+        _show_profile(profiler)
@@ -0,0 +1,41 @@
+import hashlib
+import streamlit as st
+
+from utils.constants import XLSX_MIME
+from utils.profiling import span
+from utils.tools import to_excel
+
+def dataframe_digest(df):
+    import pandas as pd
+    with span("export hash"):
+        digest = hashlib.sha1(repr(list(df.columns)).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        return digest.hexdigest()
+
+# Workbooks are memoized by content hash, so identical tables across reruns and sessions are only written once
+@st.cache_data(max_entries=64, show_spinner=False)
+def _excel_bytes(digest, _df):
+    return to_excel(_df).getvalue()
+
+# With prepare=True the workbook is only built once the user asks for it; the fragment keeps
+# that click from rerunning the whole page
+@st.fragment
+def excel_download(df, label, file_name, key, prepare=False):
+    digest = dataframe_digest(df)
+    prepared_key = f"{key}_prepared"
+
+    if prepare and st.session_state.get(prepared_key) != digest:
+        if not st.button("⚙️ Prepare Excel", key=f"{key}_prepare", help=label):
+            return
+        st.session_state[prepared_key] = digest
+
+    with st.spinner("📝 Building Excel file..."):
+        data = _excel_bytes(digest, df)
+    st.download_button(
+        label=label,
+        data=data,
+        file_name=file_name,
+        mime=XLSX_MIME,
+        key=f"{key}_download",
+        on_click="ignore"
+    )
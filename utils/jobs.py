@@ -0,0 +1,315 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import streamlit as st
+
+from utils.albums import get_album_tracks, build_album_rows
+from utils.api import SpotifyAPIError
+from utils.auth import get_access_token
+from utils.catalog import get_artist_albums, get_album_details
+from utils.playlists import get_playlist_metadata_and_tracks, build_playlist_rows
+from utils.profiling import recording, span
+from utils.snapshots import save_snapshot
+from utils.tracks import get_tracks
+
+# SQLite-backed job queue shared by every session (and by standalone workers started with `python -m utils.jobs`)
+JOBS_DB = os.environ.get("SPOTTOOLS_JOBS_DB", os.path.join(".spottools", "jobs.db"))
+WORKER_THREADS = int(os.environ.get("SPOTTOOLS_WORKER_THREADS", "2"))
+POLL_INTERVAL = 1.0
+# Running jobs without a heartbeat for this long belonged to a worker that died and are requeued
+STALE_AFTER = 300
+# Record per-stage timings for every job (shown on the Jobs page)
+JOB_TIMINGS = os.environ.get("SPOTTOOLS_JOB_TIMINGS", "0") == "1"
+
+JOB_KINDS = {
+    "catalog": "Artist Catalog",
+    "album": "Albums",
+    "playlist": "Playlist",
+}
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def _connect():
+    os.makedirs(os.path.dirname(JOBS_DB) or ".", exist_ok=True)
+    conn = sqlite3.connect(JOBS_DB, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            label TEXT,
+            params TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            progress INTEGER NOT NULL DEFAULT 0,
+            total INTEGER NOT NULL DEFAULT 0,
+            items INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            result BLOB,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL,
+            heartbeat REAL,
+            timings TEXT
+        )
+    """)
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+    if "timings" not in columns:
+        conn.execute("ALTER TABLE jobs ADD COLUMN timings TEXT")
+    return conn
+
+
+def submit_job(kind, params, label=None):
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown job type: {kind}")
+    conn = _connect()
+    try:
+        cursor = conn.execute(
+            "INSERT INTO jobs (kind, label, params, created_at) VALUES (?, ?, ?, ?)",
+            (kind, label or JOB_KINDS[kind], json.dumps(params), time.time())
+        )
+        return cursor.lastrowid
+    finally:
+        conn.close()
+
+
+def list_jobs(limit=100):
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            "SELECT id, kind, label, status, progress, total, items, error, created_at, started_at, finished_at, timings "
+            "FROM jobs ORDER BY id DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+    finally:
+        conn.close()
+
+
+def get_job_rows(job_id):
+    conn = _connect()
+    try:
+        row = conn.execute("SELECT result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    finally:
+        conn.close()
+    if row is None or row["result"] is None:
+        return []
+    return json.loads(zlib.decompress(row["result"]))
+
+
+def cancel_job(job_id):
+    conn = _connect()
+    try:
+        conn.execute(
+            "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status IN ('queued', 'running')",
+            (time.time(), job_id)
+        )
+    finally:
+        conn.close()
+
+
+def job_throughput(job):
+    # Tracks per second over the job's runtime so far
+    if not job["started_at"] or not job["items"]:
+        return None
+    elapsed = (job["finished_at"] or time.time()) - job["started_at"]
+    return job["items"] / elapsed if elapsed > 0 else None
+
+
+# Like the Multiple Artist Catalog page: a failed release keeps the job going but skips that
+# artist's snapshot, so only complete runs are stored
+def _run_catalog(params, access_token, report):
+    rows = []
+    errors = []
+    for artist_id in params["artist_ids"]:
+        try:
+            albums = get_artist_albums(artist_id, params["market"], access_token)
+        except SpotifyAPIError as e:
+            errors.append(f"Artist {artist_id}: {e}")
+            continue
+        report(total=len(albums))
+        releases = []
+        complete = True
+        for album in albums:
+            try:
+                tracks, _, _ = get_album_details(album.id, access_token)
+            except SpotifyAPIError as e:
+                complete = False
+                errors.append(f"Artist {artist_id}, {album.name}: {e}")
+                report(advance=1)
+                continue
+            rows.extend(tracks)
+            releases.append((album.id, tracks))
+            report(advance=1, items=len(tracks))
+        if complete:
+            save_snapshot(artist_id, params["market"], releases)
+        else:
+            errors.append(f"Artist {artist_id}: snapshot not saved because some releases could not be fetched")
+    return rows, errors
+
+
+def _run_album(params, access_token, report):
+    rows = []
+    errors = []
+    report(total=len(params["album_ids"]))
+    for album_id in params["album_ids"]:
+        album_rows = []
+        try:
+            track_ids, album = get_album_tracks(album_id, access_token)
+        except SpotifyAPIError as e:
+            errors.append(f"Album {album_id}: {e}")
+            track_ids = []
+        if track_ids:
+            tracks = get_tracks(track_ids, access_token)
+            if len(tracks) < len(track_ids):
+                errors.append(f"Album {album_id}: only {len(tracks)} of {len(track_ids)} tracks could be fetched")
+            album_rows = build_album_rows(tracks, album)
+            rows.extend(album_rows)
+        report(advance=1, items=len(album_rows))
+    return rows, errors
+
+
+def _run_playlist(params, access_token, report):
+    report(total=1)
+    _, _, playlist_tracks = get_playlist_metadata_and_tracks(params["playlist_id"], access_token)
+    rows = build_playlist_rows(playlist_tracks)
+    report(advance=1, items=len(rows))
+    return rows, []
+
+
+# Handlers return (rows, errors). Errors are per-item failures that didn't stop the job; they are stored
+# with the finished job because worker threads have no page to show st.error on.
+JOB_HANDLERS = {
+    "catalog": _run_catalog,
+    "album": _run_album,
+    "playlist": _run_playlist,
+}
+
+
+def _claim_next_job(conn):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        now = time.time()
+        conn.execute(
+            "UPDATE jobs SET status = 'queued' WHERE status = 'running' AND heartbeat < ?",
+            (now - STALE_AFTER,)
+        )
+        row = conn.execute("SELECT * FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1").fetchone()
+        if row is not None:
+            conn.execute(
+                "UPDATE jobs SET status = 'running', progress = 0, total = 0, items = 0, error = NULL, "
+                "started_at = ?, heartbeat = ? WHERE id = ?",
+                (now, now, row["id"])
+            )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return row
+
+
+def _make_reporter(conn, job_id):
+    def report(advance=0, total=0, items=0):
+        conn.execute(
+            "UPDATE jobs SET progress = progress + ?, total = total + ?, items = items + ?, heartbeat = ? WHERE id = ?",
+            (advance, total, items, time.time(), job_id)
+        )
+        status = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()["status"]
+        if status == "cancelled":
+            raise JobCancelled()
+    return report
+
+
+def _run_job(conn, job):
+    if JOB_TIMINGS:
+        with recording() as recorder:
+            _execute_job(conn, job)
+        conn.execute("UPDATE jobs SET timings = ? WHERE id = ?", (json.dumps(recorder.rows()), job["id"]))
+    else:
+        _execute_job(conn, job)
+
+
+def _execute_job(conn, job):
+    handler = JOB_HANDLERS.get(job["kind"])
+    try:
+        if handler is None:
+            raise ValueError(f"Unknown job type: {job['kind']}")
+        access_token = get_access_token()
+        if not access_token:
+            raise RuntimeError("Failed to get access token.")
+        rows, errors = handler(json.loads(job["params"]), access_token, _make_reporter(conn, job["id"]))
+    except JobCancelled:
+        return
+    except Exception as e:
+        conn.execute(
+            "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ? AND status = 'running'",
+            (str(e), time.time(), job["id"])
+        )
+        return
+
+    with span("store result"):
+        result = zlib.compress(json.dumps(rows).encode("utf-8"))
+    conn.execute(
+        "UPDATE jobs SET status = 'done', result = ?, error = ?, finished_at = ? WHERE id = ? AND status = 'running'",
+        (result, "\n".join(errors) or None, time.time(), job["id"])
+    )
+
+
+def _worker_loop(stop_event):
+    conn = _connect()
+    try:
+        while not stop_event.is_set():
+            job = _claim_next_job(conn)
+            if job is None:
+                stop_event.wait(POLL_INTERVAL)
+                continue
+            _run_job(conn, job)
+    finally:
+        conn.close()
+
+
+def start_workers(num_threads=WORKER_THREADS):
+    stop_event = threading.Event()
+    for i in range(num_threads):
+        threading.Thread(
+            target=_worker_loop,
+            args=(stop_event,),
+            name=f"spottools-worker-{i}",
+            daemon=True
+        ).start()
+    return stop_event
+
+
+# One set of worker threads per Streamlit server process, shared by all sessions.
+# Set SPOTTOOLS_INPROCESS_WORKER=0 when running dedicated workers with `python -m utils.jobs`.
+@st.cache_resource
+def ensure_workers():
+    if os.environ.get("SPOTTOOLS_INPROCESS_WORKER", "1") == "0":
+        return None
+    return start_workers()
+
+
+def submit_background_job(kind, params, label=None):
+    ensure_workers()
+    job_id = submit_job(kind, params, label=label)
+    st.success(f"✅ Job #{job_id} queued. Follow its progress on the Jobs page.")
+    st.page_link("pages/7_Jobs.py", label="Open Jobs", icon="🗂️")
+    return job_id
+
+
+if __name__ == "__main__":
+    stop_event = start_workers()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stop_event.set()
@@ -11,6 +11,19 @@ def parse_artist_id(user_input):
     else:
         return user_input
 
+def parse_artist_ids(user_input):
+    raw_items = [item.strip() for item in user_input.splitlines() if item.strip()]
+    artist_ids = []
+
+    for item in raw_items:
+        artist_id = parse_artist_id(item)
+        if artist_id and re.fullmatch(r"[a-zA-Z0-9]{22}", artist_id):
+            artist_ids.append(artist_id)
+        else:
+            st.error(f"Invalid artist: '{item}' is not a valid Spotify artist URI, URL, or ID.")
+
+    return list(dict.fromkeys(artist_ids))
+
 def parse_album_id(user_input):
     user_input = user_input.strip()
 
@@ -54,3 +67,12 @@ def parse_track_ids(user_input):
 
     return track_ids
 
+def parse_playlist_id(user_input):
+    user_input = user_input.strip()
+    if user_input.startswith("spotify:playlist:"):
+        return user_input.split(":")[2]
+    elif "open.spotify.com/playlist/" in user_input:
+        match = re.search(r"playlist/([a-zA-Z0-9]+)", user_input)
+        if match:
+            return match.group(1)
+    return user_input
@@ -0,0 +1,52 @@
+from utils.api import API_BASE, spotify_get
+from utils.profiling import span
+from utils.records import track_record
+
+# Only request the fields the playlist table uses
+PLAYLIST_FIELDS = "name,images(url)"
+PLAYLIST_TRACK_FIELDS = "items(track(type,id,name,artists(name),album(name),external_ids(isrc),external_urls(spotify),explicit,duration_ms,disc_number,track_number))"
+
+# Get playlist metadata and tracks
+def get_playlist_metadata_and_tracks(playlist_id, access_token):
+    base_url = f"{API_BASE}/playlists/{playlist_id}"
+
+    # Get metadata
+    meta_data = spotify_get(base_url, access_token, params={"fields": PLAYLIST_FIELDS})
+    playlist_name = meta_data.get("name", "Unknown Playlist")
+    playlist_image_url = meta_data["images"][0]["url"] if meta_data.get("images") else None
+
+    # Get tracks with pagination
+    tracks = []
+    offset = 0
+    limit = 100
+    while True:
+        data = spotify_get(
+            f"{base_url}/tracks",
+            access_token,
+            params={"offset": offset, "limit": limit, "fields": PLAYLIST_TRACK_FIELDS}
+        )
+        items = data.get("items", [])
+        if not items:
+            break
+        for item in items:
+            track = item.get("track")
+            if track and track.get("type", "track") == "track":
+                tracks.append(track_record(track))
+        offset += limit
+        if len(items) < limit:
+            break
+
+    return playlist_name, playlist_image_url, tracks
+
+def build_playlist_rows(playlist_tracks):
+    with span("build rows"):
+        simplified_data = []
+        for track in playlist_tracks:
+            simplified_data.append({
+                "Track Name": track.name,
+                "Artist(s)": track.artists,
+                "Album Name": track.album_name,
+                "ISRC": track.isrc,
+                "Spotify URL": track.spotify_url
+            })
+    return simplified_data
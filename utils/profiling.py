@@ -0,0 +1,183 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar, copy_context
+
+# Stage timings are only collected while a recorder is active in the current context;
+# otherwise span() hands back a shared no-op context manager.
+_recorder = ContextVar("spottools_span_recorder", default=None)
+_NULL_SPAN = nullcontext()
+# The StackSampler profiling the current run, if any
+_sampler = ContextVar("spottools_stack_sampler", default=None)
+
+SAMPLE_INTERVAL = 0.005
+
+
+class SpanRecorder:
+    def __init__(self):
+        self.totals = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        with self._lock:
+            count, total = self.totals.get(name, (0, 0.0))
+            self.totals[name] = (count + 1, total + seconds)
+
+    # Stage totals are inclusive: a span nested in another is counted in both
+    def rows(self):
+        return [
+            {"Stage": name, "Calls": count, "Total (s)": round(total, 4), "Mean (ms)": round(total / count * 1000, 2)}
+            for name, (count, total) in sorted(self.totals.items(), key=lambda item: item[1][1], reverse=True)
+        ]
+
+
+def span(name):
+    recorder = _recorder.get()
+    return _NULL_SPAN if recorder is None else recorder.span(name)
+
+
+@contextmanager
+def recording(recorder=None):
+    recorder = recorder or SpanRecorder()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+
+
+# Wraps fn to run in a copy of the caller's context, for handing work to pool threads. Spans then
+# reach the caller's recorder, and the pool thread is sampled by the caller's profiler while fn runs.
+def context_task(fn, *args, **kwargs):
+    context = copy_context()
+    return lambda: context.run(_run_sampled, fn, args, kwargs)
+
+
+def _run_sampled(fn, args, kwargs):
+    sampler = _sampler.get()
+    if sampler is None:
+        return fn(*args, **kwargs)
+    thread_id = threading.get_ident()
+    sampler.add_thread(thread_id)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        sampler.remove_thread(thread_id)
+
+
+def _thread_name(thread_id):
+    return next((thread.name for thread in threading.enumerate() if thread.ident == thread_id), f"thread-{thread_id}")
+
+
+# Samples stacks at a fixed interval and aggregates them in collapsed-stack format
+# ("outer;inner count" per line), readable by flamegraph.pl and speedscope.
+# Covers the given thread plus threads running work handed off with context_task() (e.g. the
+# top-tracks pool); stacks from those are rooted at the thread's name. Other threads, such as
+# other sessions' script runs and the background job workers, are left out.
+class StackSampler:
+    def __init__(self, thread_id=None, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.samples = Counter()
+        self._extra = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="spottools-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def add_thread(self, thread_id):
+        with self._lock:
+            self._extra.add(thread_id)
+
+    def remove_thread(self, thread_id):
+        with self._lock:
+            self._extra.discard(thread_id)
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        names = {}
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                thread_ids = {self.thread_id, *self._extra}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id not in thread_ids:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if not stack:
+                    continue
+                if thread_id != self.thread_id:
+                    if thread_id not in names:
+                        names[thread_id] = _thread_name(thread_id)
+                    stack.append(names[thread_id])
+                self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self):
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+
+# cProfile only hooks the thread that starts it (the page script); work handed to
+# other threads with context_task() shows up in the sampled stacks instead
+class RunProfiler:
+    def __init__(self):
+        import cProfile
+
+        self.profile = cProfile.Profile()
+        self.sampler = StackSampler()
+        self.error = None
+        self._token = None
+
+    def start(self):
+        try:
+            self.profile.enable()
+        except ValueError as e:
+            # Another profiler (e.g. a debugger) already owns the hook
+            self.error = str(e)
+            self.profile = None
+        self._token = _sampler.set(self.sampler)
+        self.sampler.start()
+        return self
+
+    def stop(self):
+        if self.profile is not None:
+            self.profile.disable()
+        self.sampler.stop()
+        _sampler.reset(self._token)
+
+    def pstats_bytes(self):
+        import marshal
+
+        if self.profile is None:
+            return None
+        self.profile.create_stats()
+        return marshal.dumps(self.profile.stats)
+
+    def summary(self, limit=30):
+        import io
+        import pstats
+
+        if self.profile is None:
+            return self.error or ""
+        stream = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
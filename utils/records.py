@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+
+# Compact records built straight after decoding so the full API payloads
+# (available_markets, images, preview URLs, ...) can be dropped right away
+
+@dataclass(frozen=True, slots=True)
+class TrackRecord:
+    id: str
+    name: str
+    artists: str
+    album_name: str
+    isrc: str
+    spotify_url: str
+    explicit: bool
+    duration_ms: int
+    disc_number: object
+    track_number: object
+
+
+@dataclass(frozen=True, slots=True)
+class AlbumRecord:
+    id: str
+    name: str
+    image_url: object
+    upc: str
+    label: str
+    p_line: str
+    release_date: str
+    release_type: str
+    artists: str
+
+
+@dataclass(frozen=True, slots=True)
+class ArtistRecord:
+    id: str
+    name: str
+    image_url: object
+
+
+@dataclass(frozen=True, slots=True)
+class ReleaseRecord:
+    id: str
+    name: str
+    album_type: str
+    release_date: str
+
+
+def join_artist_names(artists):
+    return ", ".join([a["name"] for a in artists or []])
+
+def track_record(track, album_name=None):
+    if not track:
+        return None
+    return TrackRecord(
+        id=track.get("id"),
+        name=track.get("name"),
+        artists=join_artist_names(track.get("artists")),
+        album_name=album_name or track.get("album", {}).get("name"),
+        isrc=track.get("external_ids", {}).get("isrc", "N/A"),
+        spotify_url=track.get("external_urls", {}).get("spotify", "N/A"),
+        explicit=track.get("explicit", False),
+        duration_ms=track.get("duration_ms", 0),
+        disc_number=track.get("disc_number", "N/A"),
+        track_number=track.get("track_number", "N/A")
+    )
+
+def album_record(album):
+    p_line = "N/A"
+    for c in album.get("copyrights", []):
+        if c.get("type") == "P":
+            p_line = c.get("text", "N/A")
+            break
+
+    return AlbumRecord(
+        id=album.get("id"),
+        name=album.get("name", "Unknown Album"),
+        image_url=album["images"][0]["url"] if album.get("images") else None,
+        upc=album.get("external_ids", {}).get("upc", "N/A"),
+        label=album.get("label", "N/A"),
+        p_line=p_line,
+        release_date=album.get("release_date", "N/A"),
+        release_type=album.get("album_type", "N/A").capitalize(),
+        artists=join_artist_names(album.get("artists"))
+    )
+
+def artist_record(artist):
+    return ArtistRecord(
+        id=artist.get("id"),
+        name=artist.get("name", "Unknown Artist"),
+        image_url=artist["images"][0]["url"] if artist.get("images") else None
+    )
+
+def release_record(album):
+    return ReleaseRecord(
+        id=album["id"],
+        name=album.get("name", ""),
+        album_type=album["album_type"],
+        release_date=album.get("release_date", "")
+    )
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from collections import Counter
+
+from utils.profiling import span
+
+# Catalog runs are kept as zlib-compressed, column-oriented JSON blobs keyed by artist and market
+SNAPSHOT_DB = os.environ.get("SPOTTOOLS_SNAPSHOT_DB", os.path.join(".spottools", "snapshots.db"))
+
+RELEASE_FIELDS = ["Album Name", "Album Artists", "Release Type", "Release Date", "UPC", "Label", "℗ Line"]
+TRACK_FIELDS = ["Track Name", "Track Artists", "ISRC", "Explicit", "Duration", "Disc Number", "Track Number"]
+
+DIFF_LABELS = {
+    "new_releases": "New releases",
+    "removed_releases": "Removed releases",
+    "changed_releases": "Release changes",
+    "new_tracks": "New tracks",
+    "removed_tracks": "Removed tracks",
+    "changed_tracks": "Track changes",
+}
+
+
+def _connect():
+    os.makedirs(os.path.dirname(SNAPSHOT_DB) or ".", exist_ok=True)
+    conn = sqlite3.connect(SNAPSHOT_DB, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            artist_id TEXT NOT NULL,
+            market TEXT NOT NULL,
+            artist_name TEXT,
+            created_at REAL NOT NULL,
+            releases INTEGER NOT NULL,
+            tracks INTEGER NOT NULL,
+            digest TEXT NOT NULL,
+            data BLOB NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS snapshots_artist_market ON snapshots (artist_id, market, created_at)")
+    return conn
+
+
+def _encode(rows):
+    columns = list(dict.fromkeys(column for row in rows for column in row))
+    payload = json.dumps(
+        {"columns": columns, "data": {column: [row.get(column) for row in rows] for column in columns}},
+        separators=(",", ":"),
+        ensure_ascii=False
+    ).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest(), zlib.compress(payload, 9)
+
+
+def _decode(blob):
+    payload = json.loads(zlib.decompress(blob))
+    columns = payload["columns"]
+    data = payload["data"]
+    return [dict(zip(columns, values)) for values in zip(*(data[column] for column in columns))]
+
+
+# releases is a list of (album_id, catalog rows). A run identical to the latest snapshot is not stored again,
+# and an empty run is never stored, since diffing against it would report every release as removed.
+def save_snapshot(artist_id, market, releases):
+    rows = [{"Album ID": album_id, **row} for album_id, tracks in releases for row in tracks]
+    if not rows:
+        return None, False
+    with span("snapshot"):
+        digest, blob = _encode(rows)
+    names = Counter(row.get("Album Artists") for row in rows if row.get("Album Artists"))
+    artist_name = names.most_common(1)[0][0] if names else None
+
+    conn = _connect()
+    try:
+        latest = conn.execute(
+            "SELECT id, digest FROM snapshots WHERE artist_id = ? AND market = ? ORDER BY created_at DESC LIMIT 1",
+            (artist_id, market)
+        ).fetchone()
+        if latest is not None and latest["digest"] == digest:
+            return latest["id"], False
+
+        cursor = conn.execute(
+            "INSERT INTO snapshots (artist_id, market, artist_name, created_at, releases, tracks, digest, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (artist_id, market, artist_name, time.time(), len(releases), len(rows), digest, blob)
+        )
+        return cursor.lastrowid, True
+    finally:
+        conn.close()
+
+
+def list_snapshot_keys():
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            "SELECT artist_id, market, MAX(artist_name) AS artist_name, COUNT(*) AS snapshots, MAX(created_at) AS latest "
+            "FROM snapshots GROUP BY artist_id, market ORDER BY latest DESC"
+        ).fetchall()
+        return [dict(row) for row in rows]
+    finally:
+        conn.close()
+
+
+def list_snapshots(artist_id, market):
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            "SELECT id, artist_id, market, artist_name, created_at, releases, tracks FROM snapshots "
+            "WHERE artist_id = ? AND market = ? ORDER BY created_at DESC",
+            (artist_id, market)
+        ).fetchall()
+        return [dict(row) for row in rows]
+    finally:
+        conn.close()
+
+
+def load_snapshot(snapshot_id):
+    conn = _connect()
+    try:
+        row = conn.execute("SELECT data FROM snapshots WHERE id = ?", (snapshot_id,)).fetchone()
+    finally:
+        conn.close()
+    return _decode(row["data"]) if row is not None else []
+
+
+def _release_summary(album_id, row, track_count):
+    return {
+        "Album ID": album_id,
+        "Album Name": row.get("Album Name"),
+        "Release Type": row.get("Release Type"),
+        "Release Date": row.get("Release Date"),
+        "UPC": row.get("UPC"),
+        "Label": row.get("Label"),
+        "Tracks": track_count
+    }
+
+
+def _field_changes(old, new, fields, base):
+    return [
+        {**base, "Field": field, "Old": old.get(field), "New": new.get(field)}
+        for field in fields
+        if old.get(field) != new.get(field)
+    ]
+
+
+# Track additions/removals are only reported for releases present in both snapshots;
+# tracks of new or removed releases are covered by the release lists.
+def diff_snapshots(old_rows, new_rows):
+    old_releases, new_releases = {}, {}
+    old_counts, new_counts = Counter(), Counter()
+    for releases, counts, rows in ((old_releases, old_counts, old_rows), (new_releases, new_counts, new_rows)):
+        for row in rows:
+            releases.setdefault(row["Album ID"], row)
+            counts[row["Album ID"]] += 1
+
+    old_tracks = {(row["Album ID"], row["Spotify URL"]): row for row in old_rows}
+    new_tracks = {(row["Album ID"], row["Spotify URL"]): row for row in new_rows}
+
+    diff = {
+        "new_releases": [_release_summary(aid, row, new_counts[aid]) for aid, row in new_releases.items() if aid not in old_releases],
+        "removed_releases": [_release_summary(aid, row, old_counts[aid]) for aid, row in old_releases.items() if aid not in new_releases],
+        "changed_releases": [],
+        "new_tracks": [],
+        "removed_tracks": [],
+        "changed_tracks": []
+    }
+
+    for album_id, new in new_releases.items():
+        old = old_releases.get(album_id)
+        if old is not None:
+            diff["changed_releases"].extend(
+                _field_changes(old, new, RELEASE_FIELDS, {"Album ID": album_id, "Album Name": new.get("Album Name")})
+            )
+
+    for key, new in new_tracks.items():
+        if key[0] not in old_releases:
+            continue
+        old = old_tracks.get(key)
+        base = {"Album Name": new.get("Album Name"), "Track Name": new.get("Track Name"), "Spotify URL": new.get("Spotify URL")}
+        if old is None:
+            diff["new_tracks"].append({**base, "ISRC": new.get("ISRC")})
+        else:
+            diff["changed_tracks"].extend(_field_changes(old, new, TRACK_FIELDS, base))
+
+    for key, old in old_tracks.items():
+        if key[0] in new_releases and key not in new_tracks:
+            diff["removed_tracks"].append({
+                "Album Name": old.get("Album Name"),
+                "Track Name": old.get("Track Name"),
+                "Spotify URL": old.get("Spotify URL"),
+                "ISRC": old.get("ISRC")
+            })
+
+    return diff
+
+
+def diff_summary(diff):
+    return ", ".join(f"{DIFF_LABELS[name]}: {len(entries)}" for name, entries in diff.items())
+
+
+# All entries of a diff in one table, e.g. for an Excel export
+def flatten_diff(diff):
+    return [{"Change": DIFF_LABELS[name], **entry} for name, entries in diff.items() for entry in entries]
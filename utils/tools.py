@@ -1,9 +1,29 @@
-import pandas as pd
 from io import BytesIO
 
+from utils.profiling import span
+
+# pandas (and XlsxWriter through it) are only imported once a table or export is actually built,
+# so pages that are just showing their input widgets stay cheap to rerun
+def to_dataframe(rows):
+    import pandas as pd
+    with span("dataframe"):
+        return pd.DataFrame(rows)
+
+def concat_dataframes(dataframes):
+    import pandas as pd
+    with span("dataframe"):
+        return pd.concat(dataframes, ignore_index=True)
+
 def to_excel(df):
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False, sheet_name='Tracks')
-    output.seek(0)
-    return output
+    import pandas as pd
+    with span("excel"):
+        output = BytesIO()
+        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+            df.to_excel(writer, index=False, sheet_name='Tracks')
+        output.seek(0)
+        return output
+
+def ms_to_min_sec(ms):
+    minutes = ms // 60000
+    seconds = (ms % 60000) // 1000
+    return f"{minutes}:{seconds:02}"
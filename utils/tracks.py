@@ -1,23 +1,74 @@
+import threading
+from concurrent.futures import Future
 import streamlit as st
-import requests
-
-def get_tracks(track_ids, access_token):
-    base_url = "https://api.spotify.com/v1/tracks"
-    headers = {
-        "Authorization": f"Bearer {access_token}"
-    }
-    tracks = []
-
-    id_chunks = [track_ids[i:i+50] for i in range(0, len(track_ids), 50)]
-
-    for chunk in id_chunks:
-        ids_param = ",".join(chunk)
-        response = requests.get(f"{base_url}?ids={ids_param}", headers=headers)
-        response_data = response.json()
-
-        if "tracks" in response_data:
-            tracks.extend(response_data["tracks"])
-        else:
-            st.error(f"Error fetching tracks: {response_data}")
-    
-    return tracks
\ No newline at end of file
+
+from utils.api import API_BASE, SpotifyAPIError, spotify_get
+from utils.profiling import span
+from utils.records import track_record
+
+# Track IDs currently being fetched by some caller. Overlapping batches wait on those
+# instead of requesting them again, and only the missing IDs are sent.
+_inflight_tracks = {}
+_inflight_lock = threading.Lock()
+_FAILED = object()
+
+def _claim(track_ids, market):
+    futures = {}
+    owned = []
+    with _inflight_lock:
+        for track_id in dict.fromkeys(track_ids):
+            future = _inflight_tracks.get((market, track_id))
+            if future is None:
+                future = Future()
+                _inflight_tracks[(market, track_id)] = future
+                owned.append(track_id)
+            futures[track_id] = future
+    return futures, owned
+
+def _fetch_owned(owned, futures, access_token, market):
+    id_chunks = [owned[i:i+50] for i in range(0, len(owned), 50)]
+
+    try:
+        for chunk in id_chunks:
+            params = {"ids": ",".join(chunk)}
+            if market:
+                params["market"] = market
+            try:
+                response_data = spotify_get(f"{API_BASE}/tracks", access_token, params=params)
+            except SpotifyAPIError as e:
+                st.error(f"Error fetching tracks: {e}")
+                for track_id in chunk:
+                    futures[track_id].set_result(_FAILED)
+                continue
+
+            with span("projection"):
+                for track_id, track in zip(chunk, response_data["tracks"]):
+                    futures[track_id].set_result(track_record(track))
+    except Exception as e:
+        for track_id in owned:
+            if not futures[track_id].done():
+                futures[track_id].set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            for track_id in owned:
+                del _inflight_tracks[(market, track_id)]
+                if not futures[track_id].done():
+                    futures[track_id].set_result(_FAILED)
+
+# Returns TrackRecords. Passing a market makes Spotify leave out each track's available_markets list.
+def get_tracks(track_ids, access_token, market=None):
+    futures, owned = _claim(track_ids, market)
+    _fetch_owned(owned, futures, access_token, market)
+    results = {track_id: future.result() for track_id, future in futures.items()}
+
+    # IDs borrowed from another caller whose batch failed are fetched again here,
+    # so a second failure is reported in this caller's session too
+    retry = [track_id for track_id, track in results.items() if track is _FAILED and track_id not in owned]
+    if retry:
+        retry_futures, retry_owned = _claim(retry, market)
+        _fetch_owned(retry_owned, retry_futures, access_token, market)
+        results.update({track_id: future.result() for track_id, future in retry_futures.items()})
+
+    tracks = [results[track_id] for track_id in track_ids]
+    return [track for track in tracks if track is not _FAILED]